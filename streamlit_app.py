@@ -104,7 +104,8 @@ def load_model() -> Tuple[object, object]:
     
     Returns:
         Tuple[object, object]: Tuple of (model, vectorizer)
-            - model: Trained scikit-learn model (Logistic Regression or Passive Aggressive)
+            - model: Trained scikit-learn model (Logistic Regression, Passive Aggressive
+              or SGDClassifier)
             - vectorizer: Fitted TF-IDF vectorizer
         
     Raises:
@@ -179,8 +180,22 @@ def validate_input(text: str) -> Tuple[bool, str]:
             - is_valid: True if validation passes, False otherwise
             - error_message: Empty string if valid, specific error message otherwise
     """
-    text_length = len(text)
+    return _validate_len(len(text))
+
+
+def _validate_len(text_length: int) -> Tuple[bool, str]:
+    """
+    Validate an article text length against the UI limits.
     
+    Length-only core of validate_input(), so boundary checks can be made
+    without building strings of the corresponding size.
+    
+    Args:
+        text_length: Number of characters in the article text
+        
+    Returns:
+        Tuple[bool, str]: Tuple of (is_valid, error_message)
+    """
     # Check minimum length
     if text_length < UIConfig.MIN_TEXT_LENGTH:
         return False, "Article text must be at least 50 characters"
@@ -1,27 +1,35 @@
 """
 News Article Credibility Classifier — Training Pipeline
 ========================================================
-Trains Logistic Regression & Passive Aggressive classifiers on the WELFake
-dataset and serializes the best model + TF-IDF vectorizer to disk.
+Trains Logistic Regression, Passive Aggressive & SGD classifiers on the
+WELFake dataset and serializes the best model + TF-IDF vectorizer to disk.
 
 Labels:  1 = Credible / True   |   0 = Fake / Misinformation
 """
 
+import argparse
+import glob
+import hashlib
+import inspect
 import os
 import re
 import time
 import warnings
 
 import joblib
+import numpy as np
 import pandas as pd
+import scipy
+import scipy.sparse as sp
+import sklearn
+from joblib import Parallel, delayed
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression, PassiveAggressiveClassifier
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    confusion_matrix,
-    f1_score,
+from sklearn.linear_model import (
+    LogisticRegression,
+    PassiveAggressiveClassifier,
+    SGDClassifier,
 )
+from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 
 warnings.filterwarnings("ignore")
@@ -29,28 +37,91 @@ warnings.filterwarnings("ignore")
 # ── Configuration ────────────────────────────────────────────────────────────
 DATASET_PATH = os.path.join(os.path.dirname(__file__), "dataset", "WELFake_Dataset.csv")
 MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
+CACHE_DIR = os.path.join(MODEL_DIR, ".cache")
 TFIDF_MAX_FEATURES = 50_000
+TFIDF_NGRAM_RANGE = (1, 2)
 TEST_SIZE = 0.20
 RANDOM_STATE = 42
 
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
-def clean_text(text: str) -> str:
-    """Lowercase, strip HTML, remove non-alpha characters."""
-    text = str(text).lower()
-    text = re.sub(r"<[^>]+>", " ", text)          # strip HTML tags
-    text = re.sub(r"[^a-z\s]", " ", text)          # keep only letters
-    text = re.sub(r"\s+", " ", text).strip()        # collapse whitespace
-    return text
+# Must stay in sync with clean_text_for_model() in credibility_analyzer.py, the
+# serving-side copy of this preprocessing. Edits here also change the feature
+# cache key (see feature_cache_path), so stale features are never reused.
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+NON_ALPHA_RUN_RE = re.compile(r"[^a-z]+")
+
+
+def clean_series(s: pd.Series) -> pd.Series:
+    """Lowercase, strip HTML, remove non-alpha characters (vectorized)."""
+    s = s.str.lower()
+    s = s.str.replace(HTML_TAG_RE, " ", regex=True)      # strip HTML tags
+    s = s.str.replace(NON_ALPHA_RUN_RE, " ", regex=True) # keep only letters, collapse gaps
+    return s.str.strip()
+
+
+def metrics_from_cm(cm):
+    """Accuracy and support-weighted F1 from a confusion matrix."""
+    total = cm.sum()
+    tp = np.diag(cm)
+    support = cm.sum(axis=1)
+    denom = support + cm.sum(axis=0)
+    f1 = np.divide(2 * tp, denom, out=np.zeros(len(tp)), where=denom > 0)
+    return float(tp.sum() / total), float((f1 * support).sum() / total)
+
+
+def feature_cache_path(vectorizer) -> str:
+    """Cache path stem for the TF-IDF output, keyed by dataset, preprocessing + vectorizer."""
+    st = os.stat(DATASET_PATH)
+    params = sorted(vectorizer.get_params().items())
+    preprocessing = (
+        inspect.getsource(clean_series), HTML_TAG_RE.pattern, NON_ALPHA_RUN_RE.pattern
+    )
+    versions = (sklearn.__version__, np.__version__, scipy.__version__)
+    key = hashlib.blake2b(
+        repr((st.st_mtime_ns, st.st_size, versions, preprocessing, params)).encode(),
+        digest_size=8,
+    ).hexdigest()
+    return os.path.join(CACHE_DIR, f"cache_{key}")
+
+
+def fit_eval(name, model, X_train, y_train, X_test, y_test, verbose=True):
+    """Fit one candidate model and score it on the held-out split."""
+    t0 = time.time()
+    model.fit(X_train, y_train)
+    elapsed = time.time() - t0
+
+    preds = model.predict(X_test)
+    # Binary labels: a single bincount over (true, pred) pairs gives the 2×2 matrix
+    cm = np.bincount(2 * y_test.astype(np.intp) + preds, minlength=4).reshape(2, 2)
+    acc, f1 = metrics_from_cm(cm)
+    metrics = {
+        "elapsed": elapsed,
+        "accuracy": acc,
+        "confusion_matrix": cm,
+        "report": classification_report(
+            y_test, preds, target_names=["Fake (0)", "Credible (1)"]
+        ) if verbose else None,
+    }
+    return name, model, f1, metrics
 
 
 # ── 1. Load & Clean ─────────────────────────────────────────────────────────
+parser = argparse.ArgumentParser(description="Train the news credibility classifier.")
+parser.add_argument(
+    "--force", action="store_true", help="rebuild TF-IDF features even if cached"
+)
+parser.add_argument(
+    "--quiet", action="store_true", help="skip the per-class classification reports"
+)
+args = parser.parse_args()
+
 print("=" * 60)
 print("  News Credibility Classifier — Training Pipeline")
 print("=" * 60)
 
 print("\n[1/5] Loading dataset …")
-df = pd.read_csv(DATASET_PATH)
+df = pd.read_csv(DATASET_PATH, usecols=["title", "text", "label"])
 print(f"      Raw rows: {len(df):,}")
 
 # Drop rows with missing title or text
@@ -64,21 +135,51 @@ for label, count in df["label"].value_counts().sort_index().items():
     tag = "Fake" if label == 0 else "Credible"
     print(f"        {label} ({tag}): {count:,}")
 
-# Combine title + text → content
-df["content"] = (df["title"].fillna("") + " " + df["text"].fillna("")).apply(clean_text)
-
 
 # ── 2. Feature Engineering ───────────────────────────────────────────────────
-print("\n[2/5] Building TF-IDF features …")
 tfidf = TfidfVectorizer(
     max_features=TFIDF_MAX_FEATURES,
     stop_words="english",
-    ngram_range=(1, 2),
+    ngram_range=TFIDF_NGRAM_RANGE,
     sublinear_tf=True,
+    dtype=np.float32,
 )
 
-X = tfidf.fit_transform(df["content"])
-y = df["label"]
+cache_path = feature_cache_path(tfidf)
+matrix_cache, tfidf_cache = cache_path + ".npz", cache_path + ".joblib"
+if os.path.exists(matrix_cache) and os.path.exists(tfidf_cache) and not args.force:
+    print("\n[2/5] Loading cached TF-IDF features …")
+    X = sp.load_npz(matrix_cache)
+    tfidf = joblib.load(tfidf_cache)
+    if X.shape[0] != len(df):
+        raise ValueError(
+            f"Cached feature matrix has {X.shape[0]:,} rows but the dataset has "
+            f"{len(df):,} after cleanup — rerun with --force to rebuild it."
+        )
+else:
+    print("\n[2/5] Building TF-IDF features …")
+    # Combine title + text → content
+    df["content"] = clean_series(df["title"].fillna("") + " " + df["text"].fillna(""))
+
+    X = tfidf.fit_transform(df["content"])
+    X.sort_indices()
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Raw .npy arrays in a zip — no pickle overhead for the large matrix
+    sp.save_npz(matrix_cache, X, compressed=False)
+    joblib.dump(tfidf, tfidf_cache)
+
+    # Only the current entry is ever reusable — drop stale training matrices
+    for stale in glob.glob(os.path.join(CACHE_DIR, "cache_*")):
+        if stale not in (matrix_cache, tfidf_cache):
+            os.remove(stale)
+
+# Keep CSR index arrays 32-bit — they are read on every sparse product
+if X.nnz >= 2**31:
+    raise ValueError(f"Feature matrix has {X.nnz:,} non-zeros — too many for int32 indices.")
+X.indices = X.indices.astype(np.int32, copy=False)
+X.indptr = X.indptr.astype(np.int32, copy=False)
+y = df["label"].to_numpy(np.int8)
 print(f"      Feature matrix: {X.shape[0]:,} samples × {X.shape[1]:,} features")
 
 
@@ -95,34 +196,37 @@ print("\n[4/5] Training models …\n")
 
 models = {
     "Logistic Regression": LogisticRegression(
-        C=1.0, max_iter=1000, solver="lbfgs", random_state=RANDOM_STATE, n_jobs=-1
+        C=1.0, max_iter=1000, solver="liblinear", random_state=RANDOM_STATE
     ),
     "Passive Aggressive": PassiveAggressiveClassifier(
-        max_iter=50, random_state=RANDOM_STATE, n_jobs=-1
+        max_iter=50, random_state=RANDOM_STATE
+    ),
+    "SGD (log loss)": SGDClassifier(
+        loss="log_loss", alpha=1e-5, average=True, max_iter=20, random_state=RANDOM_STATE
     ),
 }
 
-best_name, best_model, best_f1 = None, None, 0.0
+# Candidates are independent and share read-only inputs — fit them side by side
+results = Parallel(n_jobs=len(models), backend="loky")(
+    delayed(fit_eval)(name, model, X_train, y_train, X_test, y_test, verbose=not args.quiet)
+    for name, model in models.items()
+)
 
-for name, model in models.items():
-    t0 = time.time()
-    model.fit(X_train, y_train)
-    elapsed = time.time() - t0
+best_name, best_model, best_f1 = None, None, 0.0
 
-    preds = model.predict(X_test)
-    acc = accuracy_score(y_test, preds)
-    f1 = f1_score(y_test, preds, average="weighted")
-    cm = confusion_matrix(y_test, preds)
+for name, model, f1, metrics in results:
+    cm = metrics["confusion_matrix"]
 
     print(f"  ▸ {name}")
-    print(f"    Trained in {elapsed:.1f}s")
-    print(f"    Accuracy : {acc:.4f}")
+    print(f"    Trained in {metrics['elapsed']:.1f}s")
+    print(f"    Accuracy : {metrics['accuracy']:.4f}")
     print(f"    F1 Score : {f1:.4f}")
     print(f"    Confusion Matrix:")
     print(f"      {cm[0]}")
     print(f"      {cm[1]}")
-    print(f"\n    Classification Report:")
-    print(classification_report(y_test, preds, target_names=["Fake (0)", "Credible (1)"]))
+    if metrics["report"] is not None:
+        print(f"\n    Classification Report:")
+        print(metrics["report"])
     print("-" * 50)
 
     if f1 > best_f1:
@@ -134,8 +238,8 @@ print(f"\n[5/5] Best model: {best_name} (F1={best_f1:.4f})")
 print(f"      Saving to {MODEL_DIR}/ …")
 
 os.makedirs(MODEL_DIR, exist_ok=True)
-joblib.dump(best_model, os.path.join(MODEL_DIR, "best_model.joblib"))
-joblib.dump(tfidf, os.path.join(MODEL_DIR, "tfidf_vectorizer.joblib"))
+joblib.dump(best_model, os.path.join(MODEL_DIR, "best_model.joblib"), compress=3)
+joblib.dump(tfidf, os.path.join(MODEL_DIR, "tfidf_vectorizer.joblib"), compress=3)
 
 # Save metadata
 with open(os.path.join(MODEL_DIR, "metadata.txt"), "w") as f: